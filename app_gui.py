@@ -10,32 +10,159 @@ import threading
 import os
 import sys
 import json
+import queue
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Ensure we can find our modules when running as .exe
 if getattr(sys, 'frozen', False):
     os.chdir(os.path.dirname(sys.executable))
 
 import config
-from style_extractor import extract_style, load_style_profile, load_samples, build_samples_text
-from outlook_client import (
-    get_unread_emails, create_draft_reply, list_folders,
-    export_emails_from_sender,
+from response_cache import make_key, get_cached_reply, store_reply
+
+# The Outlook (pywin32) and Gemini backends are slow to import, so they are
+# imported inside the actions that need them to let the window appear first.
+
+
+# How often (ms) the UI thread drains callbacks queued by background actions
+UI_POLL_MS = 50
+
+# Longest email body shown in the Respond tab
+BODY_PREVIEW_CHARS = 2000
+
+# Dark theme colors
+BG = "#1e1e2e"
+SURFACE = "#282840"
+ACCENT = "#7c3aed"
+ACCENT_HOVER = "#6d28d9"
+TEXT_FG = "#e0e0e0"
+MUTED = "#888"
+
+# ttk style options, applied once in OritDvaApp._build_styles
+_STYLE_SPEC = {
+    "TFrame": {"background": BG},
+    "Surface.TFrame": {"background": SURFACE},
+    "TLabel": {"background": BG, "foreground": TEXT_FG, "font": ("Segoe UI", 10)},
+    "Header.TLabel": {"background": BG, "foreground": "#fff",
+                      "font": ("Segoe UI", 18, "bold")},
+    "Sub.TLabel": {"background": BG, "foreground": MUTED, "font": ("Segoe UI", 9)},
+    "Surface.TLabel": {"background": SURFACE, "foreground": TEXT_FG,
+                       "font": ("Segoe UI", 10)},
+    "Accent.TButton": {"background": ACCENT, "foreground": "white",
+                       "font": ("Segoe UI", 10, "bold"), "padding": (16, 8)},
+    "TButton": {"background": SURFACE, "foreground": TEXT_FG,
+                "font": ("Segoe UI", 10), "padding": (12, 6)},
+    "TEntry": {"fieldbackground": SURFACE, "foreground": TEXT_FG,
+               "font": ("Segoe UI", 10), "padding": 6},
+    "TNotebook": {"background": BG},
+    "TNotebook.Tab": {"background": SURFACE, "foreground": TEXT_FG,
+                      "font": ("Segoe UI", 10), "padding": (12, 6)},
+}
+
+_STYLE_MAP = {
+    "Accent.TButton": {"background": [("active", ACCENT_HOVER), ("disabled", "#444")]},
+    "TButton": {"background": [("active", "#3a3a5c")]},
+    "TNotebook.Tab": {"background": [("selected", ACCENT)],
+                      "foreground": [("selected", "white")]},
+}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to at most limit characters without splitting a visible character.
+
+    Keeps combining marks, emoji ZWJ sequences, skin-tone modifiers and flag
+    pairs together with the character they belong to.
+    """
+    if len(text) <= limit:
+        return text
+    cut = limit
+    # Back off over combining marks (e.g. Hebrew niqqud), emoji joiners/selectors
+    # and skin-tone modifiers
+    while cut > 0 and (unicodedata.combining(text[cut])
+                       or text[cut] in "\u200d\ufe0f"
+                       or "\U0001F3FB" <= text[cut] <= "\U0001F3FF"
+                       or text[cut - 1] == "\u200d"):
+        cut -= 1
+    # Flags are pairs of regional indicators: don't keep an unpaired one
+    run = 0
+    while cut - run > 0 and _is_regional_indicator(text[cut - run - 1]):
+        run += 1
+    if run % 2:
+        cut -= 1
+    return text[:cut]
+
+
+def _is_regional_indicator(char: str) -> bool:
+    return "\U0001F1E6" <= char <= "\U0001F1FF"
+
+
+# Runs of emoji/pictographs (with joiners and variation selectors) in log output
+_EMOJI_RUN_RE = re.compile(
+    "[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF"
+    "\u2B00-\u2BFF\uFE0F\u200D]+"
 )
-from response_generator import generate_reply
 
 
 class LogRedirector:
-    """Redirects print() output to the GUI log panel."""
+    """Redirects print() output to the GUI log panel.
 
-    def __init__(self, text_widget):
+    Writes are queued and drained in a single insert on the next idle tick,
+    so noisy background operations don't redraw the widget per fragment.
+    The widget is capped at MAX_LINES; older lines are trimmed from the top.
+    """
+
+    MAX_LINES = 5000
+
+    def __init__(self, text_widget, schedule=None, emoji_tag=None):
         self.text_widget = text_widget
+        self.emoji_tag = emoji_tag
+        self._schedule = schedule or text_widget.after_idle
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
 
     def write(self, message):
+        if not message:
+            return
+        with self._lock:
+            self._pending.append(message)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule(self._flush)
+
+    def _flush(self):
+        with self._lock:
+            chunks, self._pending = self._pending, deque()
+            self._scheduled = False
+        if not chunks:
+            return
+
         self.text_widget.configure(state="normal")
-        self.text_widget.insert(tk.END, message)
+        self.text_widget.insert(tk.END, *self._runs("".join(chunks)))
+        lines = int(self.text_widget.index("end-1c").split(".")[0])
+        if lines > self.MAX_LINES:
+            self.text_widget.delete("1.0", f"{lines - self.MAX_LINES}.0")
         self.text_widget.see(tk.END)
         self.text_widget.configure(state="disabled")
 
+    def _runs(self, text):
+        """Split text into (chars, tags) insert arguments, tagging emoji runs."""
+        if self.emoji_tag is None:
+            return (text,)
+        args, start = [], 0
+        for match in _EMOJI_RUN_RE.finditer(text):
+            if match.start() > start:
+                args += [text[start:match.start()], ()]
+            args += [match.group(), (self.emoji_tag,)]
+            start = match.end()
+        if start < len(text):
+            args += [text[start:], ()]
+        return args
+
     def flush(self):
         pass
 
@@ -57,8 +184,29 @@ class OritDvaApp:
         self.style_profile = None
         self.current_emails = []
         self.current_email_index = 0
+        self._pending_email_paint = False
+        self._painted_entry_id = None
+        self._profile_status_stamp = None
+
+        # Background workers for Outlook/Gemini calls; one in-flight job per action
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="oritdva")
+        self._inflight = {}
+        # Set on close so long-running jobs (e.g. a collect) stop early
+        self._stop = threading.Event()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Workers never touch Tk directly: UI callbacks are queued and run on this thread
+        self._ui_thread = threading.get_ident()
+        self._ui_queue = queue.SimpleQueue()
+        self._ui_pump_running = False
+
+        # Latest-wins text for status StringVars, applied once per UI tick
+        self._pending_vars = {}
+        self._vars_lock = threading.Lock()
+        self._vars_scheduled = False
 
         self._build_styles()
+        self._enable_clipboard()
         self._build_ui()
         self._redirect_output()
         self._load_env()
@@ -68,43 +216,10 @@ class OritDvaApp:
         style = ttk.Style()
         style.theme_use("clam")
 
-        # Dark theme colors
-        bg = "#1e1e2e"
-        surface = "#282840"
-        accent = "#7c3aed"
-        accent_hover = "#6d28d9"
-        text_fg = "#e0e0e0"
-        muted = "#888"
-
-        style.configure("TFrame", background=bg)
-        style.configure("Surface.TFrame", background=surface)
-        style.configure("TLabel", background=bg, foreground=text_fg, font=("Segoe UI", 10))
-        style.configure("Header.TLabel", background=bg, foreground="#fff",
-                        font=("Segoe UI", 18, "bold"))
-        style.configure("Sub.TLabel", background=bg, foreground=muted,
-                        font=("Segoe UI", 9))
-        style.configure("Surface.TLabel", background=surface, foreground=text_fg,
-                        font=("Segoe UI", 10))
-
-        style.configure("Accent.TButton", background=accent, foreground="white",
-                        font=("Segoe UI", 10, "bold"), padding=(16, 8))
-        style.map("Accent.TButton",
-                  background=[("active", accent_hover), ("disabled", "#444")])
-
-        style.configure("TButton", background=surface, foreground=text_fg,
-                        font=("Segoe UI", 10), padding=(12, 6))
-        style.map("TButton",
-                  background=[("active", "#3a3a5c")])
-
-        style.configure("TEntry", fieldbackground=surface, foreground=text_fg,
-                        font=("Segoe UI", 10), padding=6)
-
-        style.configure("TNotebook", background=bg)
-        style.configure("TNotebook.Tab", background=surface, foreground=text_fg,
-                        font=("Segoe UI", 10), padding=(12, 6))
-        style.map("TNotebook.Tab",
-                  background=[("selected", accent)],
-                  foreground=[("selected", "white")])
+        for name, options in _STYLE_SPEC.items():
+            style.configure(name, **options)
+        for name, options in _STYLE_MAP.items():
+            style.map(name, **options)
 
     # ── UI Layout ────────────────────────────────────────────
     def _build_ui(self):
@@ -144,9 +259,10 @@ class OritDvaApp:
         notebook.add(self.log_tab, text="  📋  Log  ")
         self._build_log_tab()
 
-    def _enable_clipboard(self, widget):
-        """Enable Ctrl+V, Ctrl+C, Ctrl+A on a widget."""
+    def _enable_clipboard(self):
+        """Enable Ctrl+V, Ctrl+C, Ctrl+A on every tk.Entry via class bindings."""
         def paste(event):
+            widget = event.widget
             try:
                 text = widget.clipboard_get()
                 # If there's a selection, replace it
@@ -160,6 +276,7 @@ class OritDvaApp:
             return "break"
 
         def copy(event):
+            widget = event.widget
             try:
                 widget.clipboard_clear()
                 text = widget.selection_get()
@@ -169,16 +286,14 @@ class OritDvaApp:
             return "break"
 
         def select_all(event):
-            widget.select_range(0, tk.END)
-            widget.icursor(tk.END)
+            event.widget.select_range(0, tk.END)
+            event.widget.icursor(tk.END)
             return "break"
 
-        widget.bind("<Control-v>", paste)
-        widget.bind("<Control-V>", paste)
-        widget.bind("<Control-c>", copy)
-        widget.bind("<Control-C>", copy)
-        widget.bind("<Control-a>", select_all)
-        widget.bind("<Control-A>", select_all)
+        # Keysyms are case-sensitive, so both cases are bound (once, for the whole class)
+        for key, handler in (("v", paste), ("c", copy), ("a", select_all)):
+            self.root.bind_class("Entry", f"<Control-{key}>", handler)
+            self.root.bind_class("Entry", f"<Control-{key.upper()}>", handler)
 
     def _build_setup_tab(self):
         f = self.setup_tab
@@ -193,7 +308,6 @@ class OritDvaApp:
             selectbackground="#7c3aed", selectforeground="white"
         )
         key_entry.pack(anchor="w", padx=20, pady=(0, 5))
-        self._enable_clipboard(key_entry)
 
         ttk.Label(f, text="Samples Directory:").pack(anchor="w", **pad)
         dir_frame = ttk.Frame(f)
@@ -212,7 +326,8 @@ class OritDvaApp:
         ttk.Button(btn_frame, text="💾  Save Settings", style="Accent.TButton",
                    command=self._save_settings).pack(side="left")
         ttk.Button(btn_frame, text="🧪  Test Connection",
-                   command=lambda: self._run_async(self._test_connection)).pack(
+                   command=lambda: self._run_async(
+                       self._test_connection, self.api_key_var.get().strip())).pack(
             side="left", padx=(10, 0))
 
         # Status profile info
@@ -242,9 +357,14 @@ class OritDvaApp:
         btn_frame.pack(anchor="w", padx=20, pady=5)
 
         ttk.Button(btn_frame, text="📤  Collect from Outlook", style="Accent.TButton",
-                   command=lambda: self._run_async(self._collect_emails)).pack(side="left")
+                   command=lambda: self._run_async(
+                       self._collect_emails, self.sender_var.get().strip(),
+                       self.max_collect_var.get(), self.samples_dir_var.get().strip())
+                   ).pack(side="left")
         ttk.Button(btn_frame, text="🔍  Build Style Profile",
-                   command=lambda: self._run_async(self._extract_style)).pack(
+                   command=lambda: self._run_async(
+                       self._extract_style, self.api_key_var.get().strip(),
+                       self.samples_dir_var.get().strip())).pack(
             side="left", padx=(10, 0))
 
         # Collect progress
@@ -259,7 +379,8 @@ class OritDvaApp:
         ctrl = ttk.Frame(f)
         ctrl.pack(fill="x", padx=20, pady=10)
         ttk.Button(ctrl, text="📬  Fetch Unread Emails", style="Accent.TButton",
-                   command=lambda: self._run_async(self._fetch_emails)).pack(side="left")
+                   command=lambda: self._run_async(
+                       self._fetch_emails, self.folder_var.get().strip())).pack(side="left")
         self.email_count_var = tk.StringVar(value="No emails loaded")
         ttk.Label(ctrl, textvariable=self.email_count_var, style="Sub.TLabel").pack(
             side="left", padx=(15, 0))
@@ -291,9 +412,18 @@ class OritDvaApp:
         btn_row = ttk.Frame(reply_frame)
         btn_row.pack(anchor="w", pady=5)
         ttk.Button(btn_row, text="🤖  Generate Reply", style="Accent.TButton",
-                   command=lambda: self._run_async(self._generate_reply)).pack(side="left")
+                   command=lambda: self._run_async(
+                       self._generate_reply, *self._reply_inputs(), key="generate_reply")
+                   ).pack(side="left")
+        # Same key as Generate: only one of the two may be writing the reply at a time
+        ttk.Button(btn_row, text="🔄  Regenerate",
+                   command=lambda: self._run_async(
+                       self._regenerate_reply, *self._reply_inputs(), key="generate_reply")
+                   ).pack(
+            side="left", padx=(10, 0))
         ttk.Button(btn_row, text="💾  Save as Draft",
-                   command=lambda: self._run_async(self._save_draft)).pack(
+                   command=lambda: self._run_async(
+                       self._save_draft, self.reply_text.get("1.0", tk.END).strip())).pack(
             side="left", padx=(10, 0))
         ttk.Button(btn_row, text="⏭  Next Email",
                    command=self._next_email).pack(side="left", padx=(10, 0))
@@ -301,7 +431,7 @@ class OritDvaApp:
         # Reply display
         self.reply_text = scrolledtext.ScrolledText(
             f, height=6, bg="#282840", fg="#a5f3a5",
-            font=("Consolas", 9), wrap="word",
+            font=("Consolas", 9), wrap="word", undo=True,
             insertbackground="#e0e0e0", relief="flat"
         )
         self.reply_text.pack(fill="both", expand=True, padx=20, pady=(0, 10))
@@ -313,19 +443,108 @@ class OritDvaApp:
             insertbackground="#e0e0e0", relief="flat"
         )
         self.log_text.pack(fill="both", expand=True, padx=15, pady=10)
+        # Status emoji get an emoji font; the rest of the log stays in Consolas
+        self.log_text.tag_configure("emoji", font=("Segoe UI Emoji", 9))
 
     # ── Helpers ──────────────────────────────────────────────
     def _redirect_output(self):
-        sys.stdout = LogRedirector(self.log_text)
-        sys.stderr = LogRedirector(self.log_text)
+        sys.stdout = LogRedirector(self.log_text, self._call_in_ui, "emoji")
+        sys.stderr = LogRedirector(self.log_text, self._call_in_ui, "emoji")
+
+    def _run_async(self, func, *args, key=None):
+        """Run func(*args) on the worker pool to keep UI responsive.
+
+        Only one job per key (default: the function name) runs at a time.
+        Call from the Tk thread; read any widget values here and pass them
+        in as args, since workers must not touch Tk.
+        """
+        name = key or func.__name__
+        running = self._inflight.get(name)
+        if running is not None and not running.done():
+            self._set_status("⏳ Still working on the previous request...")
+            return
+
+        future = self._executor.submit(func, *args)
+        self._inflight[name] = future
+        future.add_done_callback(
+            lambda f: self._call_in_ui(self._on_action_done, name, f)
+        )
+        self._start_ui_pump()
 
-    def _run_async(self, func):
-        """Run a function in a background thread to keep UI responsive."""
-        thread = threading.Thread(target=func, daemon=True)
-        thread.start()
+    def _call_in_ui(self, callback, *args):
+        """Run callback on the Tk thread. Safe to call from worker threads."""
+        if threading.get_ident() == self._ui_thread:
+            self.root.after_idle(callback, *args)
+        else:
+            self._ui_queue.put((callback, args))
+
+    def _start_ui_pump(self):
+        if not self._ui_pump_running:
+            self._ui_pump_running = True
+            self.root.after(UI_POLL_MS, self._pump_ui_queue)
+
+    def _pump_ui_queue(self):
+        """Drain queued UI callbacks; keeps polling only while actions are running."""
+        while True:
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+        if self._inflight or not self._ui_queue.empty():
+            self.root.after(UI_POLL_MS, self._pump_ui_queue)
+        else:
+            self._ui_pump_running = False
+
+    def _on_action_done(self, name, future):
+        if self._inflight.get(name) is future:
+            del self._inflight[name]
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._set_status(f"❌ Error: {error}")
+            print(f"❌ {name} failed: {error}")
+
+    def _on_close(self):
+        # Pool workers aren't daemon threads, so the process lives until running
+        # jobs return: queued ones are cancelled and running ones asked to stop
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
+    def _get_client(self, api_key):
+        """Return the shared Gemini client for the API key entered in Setup."""
+        from gemini_client import get_client
+        return get_client(api_key)
+
+    def _reply_inputs(self):
+        """API key and extra instructions for a reply job (read on the Tk thread)."""
+        return self.api_key_var.get().strip(), self.context_var.get().strip()
 
     def _set_status(self, text):
-        self.root.after(0, lambda: self.status_var.set(text))
+        self._set_var(self.status_var, text)
+
+    def _set_var(self, var, text):
+        """Set a StringVar from any thread; superseded values are never applied."""
+        with self._vars_lock:
+            self._pending_vars[str(var)] = (var, text)
+            if self._vars_scheduled:
+                return
+            self._vars_scheduled = True
+        self._call_in_ui(self._flush_vars)
+
+    def _flush_vars(self):
+        with self._vars_lock:
+            pending, self._pending_vars = self._pending_vars, {}
+            self._vars_scheduled = False
+        for var, text in pending.values():
+            if var.get() != text:
+                var.set(text)
 
     def _browse_samples(self):
         path = filedialog.askdirectory(title="Select Samples Directory")
@@ -333,22 +552,33 @@ class OritDvaApp:
             self.samples_dir_var.set(path)
 
     def _check_profile_status(self):
+        from style_extractor import load_style_profile
+
         path = config.STYLE_PROFILE_PATH
-        if os.path.exists(path):
-            try:
-                profile = load_style_profile(path)
-                tone = profile.get("tone", "N/A")
-                formality = profile.get("formality_level", "N/A")
-                self.profile_status_var.set(
-                    f"✅ Style profile loaded — Tone: {tone}, Formality: {formality}/10"
-                )
-                self.style_profile = profile
-            except Exception:
-                self.profile_status_var.set("⚠ Style profile exists but could not be loaded")
-        else:
+        try:
+            stamp = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            self._profile_status_stamp = None
             self.profile_status_var.set(
                 "⚠ No style profile yet — go to Collect tab to build one"
             )
+            return
+
+        # Nothing to do if the profile file hasn't changed since the last check
+        if stamp == self._profile_status_stamp:
+            return
+        self._profile_status_stamp = stamp
+
+        try:
+            profile = load_style_profile(path, stamp[1])
+            tone = profile.get("tone", "N/A")
+            formality = profile.get("formality_level", "N/A")
+            self.profile_status_var.set(
+                f"✅ Style profile loaded — Tone: {tone}, Formality: {formality}/10"
+            )
+            self.style_profile = profile
+        except Exception:
+            self.profile_status_var.set("⚠ Style profile exists but could not be loaded")
 
     def _load_env(self):
         """Load existing .env if present."""
@@ -365,14 +595,26 @@ class OritDvaApp:
     def _save_settings(self):
         """Save settings to .env file."""
         env_path = os.path.join(os.getcwd(), ".env")
-        lines = [
-            f'GEMINI_API_KEY={self.api_key_var.get().strip()}',
-            f'OUTLOOK_FOLDER={self.folder_var.get().strip()}',
-            f'STYLE_SAMPLES_DIR={self.samples_dir_var.get().strip()}',
-            f'STYLE_PROFILE_PATH=./style_profile.json',
-        ]
-        with open(env_path, "w") as f:
-            f.write("\n".join(lines) + "\n")
+        content = (
+            f"GEMINI_API_KEY={self.api_key_var.get().strip()}\n"
+            f"OUTLOOK_FOLDER={self.folder_var.get().strip()}\n"
+            f"STYLE_SAMPLES_DIR={self.samples_dir_var.get().strip()}\n"
+            f"STYLE_PROFILE_PATH=./style_profile.json\n"
+        ).encode("utf-8")
+
+        existing = None
+        try:
+            with open(env_path, "rb") as f:
+                existing = f.read()
+        except FileNotFoundError:
+            pass
+
+        # Write to a temp file and swap it in, so a crash never leaves a half-written .env
+        if existing != content:
+            tmp_path = env_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, env_path)
 
         # Update runtime config
         config.GEMINI_API_KEY = self.api_key_var.get().strip()
@@ -382,116 +624,140 @@ class OritDvaApp:
         self._set_status("Settings saved!")
         print("💾 Settings saved to .env")
 
-    def _test_connection(self):
+    def _test_connection(self, api_key):
         self._set_status("Testing connections...")
-        print("\n🧪 Testing Gemini API...")
 
-        api_key = self.api_key_var.get().strip()
+        # Gemini (network) and Outlook (COM) are independent, so check them side by side
+        outlook_check = self._executor.submit(self._test_outlook)
+        gemini_result = self._test_gemini(api_key)
+        outlook_result = outlook_check.result()
+
+        print(f"\n🧪 Testing Gemini API...\n{gemini_result}")
+        print(f"\n🧪 Testing Outlook...\n{outlook_result}")
+
+        self._call_in_ui(self._check_profile_status)
+        self._set_status("Tests complete")
+
+    def _test_gemini(self, api_key):
         if not api_key:
-            print("  ❌ No API key set")
-        else:
-            try:
-                from google import genai
-                client = genai.Client(api_key=api_key)
-                response = client.models.generate_content(
-                    model=config.GEMINI_MODEL,
-                    contents="Say 'Hello' in one word."
-                )
-                print(f"  ✅ Gemini API working! Response: {response.text.strip()}")
-            except Exception as e:
-                print(f"  ❌ Gemini error: {e}")
+            return "  ❌ No API key set"
+        try:
+            client = self._get_client(api_key)
+            response = client.models.generate_content(
+                model=config.GEMINI_MODEL,
+                contents="Say 'Hello' in one word."
+            )
+            return f"  ✅ Gemini API working! Response: {response.text.strip()}"
+        except Exception as e:
+            return f"  ❌ Gemini error: {e}"
+
+    def _test_outlook(self):
+        from outlook_client import list_folders
 
-        print("\n🧪 Testing Outlook...")
         try:
             folders = list_folders()
-            print(f"  ✅ Outlook connected! Folders: {', '.join(folders)}")
+            return f"  ✅ Outlook connected! Folders: {', '.join(folders)}"
         except Exception as e:
-            print(f"  ❌ Outlook error: {e}")
+            from outlook_client import reset_outlook
+            reset_outlook()
+            return f"  ❌ Outlook error: {e}"
 
-        self._check_profile_status()
-        self._set_status("Tests complete")
+    def _collect_emails(self, sender, max_count_text, samples_dir):
+        from outlook_client import export_emails_from_sender
 
-    def _collect_emails(self):
-        sender = self.sender_var.get().strip()
         if not sender or "@" not in sender:
             self._set_status("❌ Enter a valid email address")
             return
 
         try:
-            max_count = int(self.max_collect_var.get())
+            max_count = int(max_count_text)
         except ValueError:
             max_count = 100
 
-        samples_dir = self.samples_dir_var.get().strip()
         self._set_status(f"Collecting emails from {sender}...")
-        self.root.after(0, lambda: self.collect_status_var.set("Scanning Inbox..."))
+        self._set_var(self.collect_status_var, "Scanning Inbox...")
 
         print(f"\n📤 Searching Inbox for emails from '{sender}'...")
         exported = export_emails_from_sender(
             sender_email=sender,
             output_dir=samples_dir,
             max_count=max_count,
+            stop=self._stop,
         )
 
         msg = f"✅ Exported {exported} emails"
         self._set_status(msg)
-        self.root.after(0, lambda: self.collect_status_var.set(
-            f"{msg}. Click 'Build Style Profile' to analyze them."
-        ))
+        self._set_var(self.collect_status_var,
+                      f"{msg}. Click 'Build Style Profile' to analyze them.")
         print(f"\n{msg}")
 
-    def _extract_style(self):
+    def _extract_style(self, api_key, samples_dir):
+        from style_extractor import extract_style
+
         self._set_status("Building style profile...")
-        self.root.after(0, lambda: self.collect_status_var.set("Analyzing writing style with Gemini..."))
+        self._set_var(self.collect_status_var, "Analyzing writing style with Gemini...")
 
         try:
             # Update config with current GUI values
-            config.GEMINI_API_KEY = self.api_key_var.get().strip()
-            config.STYLE_SAMPLES_DIR = self.samples_dir_var.get().strip()
+            config.GEMINI_API_KEY = api_key
+            config.STYLE_SAMPLES_DIR = samples_dir
 
             profile = extract_style(
                 samples_dir=config.STYLE_SAMPLES_DIR,
                 output_path=config.STYLE_PROFILE_PATH,
             )
+            self._profile_status_stamp = None
             self.style_profile = profile
 
             tone = profile.get("tone", "N/A")
             formality = profile.get("formality_level", "N/A")
             msg = f"✅ Style profile ready — Tone: {tone}, Formality: {formality}/10"
             self._set_status(msg)
-            self.root.after(0, lambda: self.collect_status_var.set(msg))
-            self.root.after(0, self._check_profile_status)
+            self._set_var(self.collect_status_var, msg)
+            self._call_in_ui(self._check_profile_status)
 
         except Exception as e:
             self._set_status(f"❌ Error: {e}")
             print(f"❌ Style extraction failed: {e}")
 
-    def _fetch_emails(self):
+    def _fetch_emails(self, folder):
+        from outlook_client import get_unread_emails
+
         self._set_status("Fetching unread emails...")
-        config.OUTLOOK_FOLDER = self.folder_var.get().strip()
+        config.OUTLOOK_FOLDER = folder
 
         try:
+            # Bodies are fetched on demand as the user pages through the list
             self.current_emails = get_unread_emails(
-                folder_name=config.OUTLOOK_FOLDER, max_count=20
+                folder_name=config.OUTLOOK_FOLDER, max_count=20, include_body=False
             )
             self.current_email_index = 0
 
             count = len(self.current_emails)
-            self.root.after(0, lambda: self.email_count_var.set(
-                f"{count} unread email(s)" if count else "No unread emails"
-            ))
+            self._set_var(self.email_count_var,
+                          f"{count} unread email(s)" if count else "No unread emails")
 
             if count > 0:
-                self.root.after(0, self._show_current_email)
+                self._call_in_ui(self._show_current_email)
                 self._set_status(f"Loaded {count} emails")
             else:
                 self._set_status("No unread emails found")
 
         except Exception as e:
+            from outlook_client import reset_outlook
+            reset_outlook()
             self._set_status(f"❌ Outlook error: {e}")
             print(f"❌ {e}")
 
     def _show_current_email(self):
+        """Schedule a repaint of the current email; rapid calls paint only once."""
+        if self._pending_email_paint:
+            return
+        self._pending_email_paint = True
+        self.root.after_idle(self._paint_current_email)
+
+    def _paint_current_email(self):
+        self._pending_email_paint = False
         if not self.current_emails:
             return
 
@@ -499,66 +765,138 @@ class OritDvaApp:
         total = len(self.current_emails)
         idx = self.current_email_index + 1
 
+        body_error = email.get("body_error")
+        loading = "body" not in email and body_error is None
         self.email_info_var.set(
             f"[{idx}/{total}]  From: {email['sender_name']} <{email['sender_email']}>\n"
             f"Subject: {email['subject']}  |  {email['received_time']}"
+            + ("  |  ⏳ Loading message..." if loading else "")
         )
 
+        if loading:
+            preview = ""
+            self._run_async(self._load_body, email, key=f"load_body:{email['entry_id']}")
+        elif "body" not in email:
+            # Not retried on repaint; Generate Reply tries to load it again
+            preview = f"⚠ Could not load this message: {body_error}"
+        else:
+            # Keep the truncated body on the dict so revisiting an email doesn't re-slice it
+            preview = email.get("_body_preview")
+            if preview is None:
+                preview = email["_body_preview"] = _truncate(email["body"], BODY_PREVIEW_CHARS)
+
         self.email_body_text.configure(state="normal")
-        self.email_body_text.delete("1.0", tk.END)
-        self.email_body_text.insert("1.0", email["body"][:2000])
+        self.email_body_text.replace("1.0", tk.END, preview)
         self.email_body_text.configure(state="disabled")
 
-        # Clear previous reply
-        self.reply_text.delete("1.0", tk.END)
+        # Clear previous reply (but not when only the body arrived for the same email)
+        if self._painted_entry_id != email["entry_id"]:
+            self._painted_entry_id = email["entry_id"]
+            self.reply_text.delete("1.0", tk.END)
+
+    def _ensure_body(self, email):
+        """Fetch and cache the email body if it hasn't been loaded yet (worker thread).
+
+        On failure the body stays unloaded (so a later call retries) and the
+        error is kept in email["body_error"] for display.
+        """
+        if "body" not in email:
+            from outlook_client import get_email_body
+            try:
+                email["body"] = get_email_body(email["entry_id"])
+            except Exception as e:
+                email["body_error"] = str(e)
+                raise
+            email.pop("body_error", None)
+        return email["body"]
+
+    def _load_body(self, email):
+        try:
+            self._ensure_body(email)
+        except Exception as e:
+            print(f"❌ Could not load email body: {e}")
+        self._call_in_ui(self._show_current_email)
 
     def _next_email(self):
         if self.current_emails and self.current_email_index < len(self.current_emails) - 1:
             self.current_email_index += 1
             self._show_current_email()
 
-    def _generate_reply(self):
+    def _generate_reply(self, api_key, context, use_cache=True):
+        from response_generator import generate_reply
+        from style_extractor import load_style_profile
+
         if not self.current_emails:
             self._set_status("No email selected")
             return
 
-        if not self.style_profile:
-            try:
-                self.style_profile = load_style_profile()
-            except FileNotFoundError:
+        try:
+            self.style_profile = load_style_profile()
+        except FileNotFoundError:
+            if not self.style_profile:
                 self._set_status("❌ No style profile — build one first")
                 return
 
-        config.GEMINI_API_KEY = self.api_key_var.get().strip()
+        config.GEMINI_API_KEY = api_key
         email = self.current_emails[self.current_email_index]
+        try:
+            body = self._ensure_body(email)
+        except Exception as e:
+            # Never draft (or cache) a reply to a body that didn't load
+            self._set_status(f"❌ Could not load the email body: {e}")
+            self._call_in_ui(self._show_current_email)
+            return
+        cache_key = make_key(
+            email["subject"], body, email["sender_name"], context, self.style_profile
+        )
+
+        if use_cache:
+            cached = get_cached_reply(cache_key)
+            if cached is not None:
+                self._call_in_ui(lambda: self._insert_reply(cached))
+                self._set_status("Reply loaded from cache — click Regenerate for a fresh one")
+                return
+
         self._set_status("Generating reply...")
 
         try:
             reply = generate_reply(
                 email_subject=email["subject"],
-                email_body=email["body"],
+                email_body=body,
                 sender_name=email["sender_name"],
-                additional_context=self.context_var.get().strip(),
+                additional_context=context,
                 style_profile=self.style_profile,
+                client=self._get_client(api_key),
             )
+            store_reply(cache_key, reply)
 
-            self.root.after(0, lambda: self._insert_reply(reply))
+            self._call_in_ui(lambda: self._insert_reply(reply))
             self._set_status("Reply generated — review and save as draft")
 
         except Exception as e:
             self._set_status(f"❌ Generation error: {e}")
             print(f"❌ {e}")
 
+    def _regenerate_reply(self, api_key, context):
+        """Generate a fresh reply, bypassing the reply cache."""
+        self._generate_reply(api_key, context, use_cache=False)
+
     def _insert_reply(self, text):
+        if self.reply_text.get("1.0", "end-1c") == text:
+            return
+        # Separate the replacement in the undo stack so Ctrl+Z restores the edited reply
+        self.reply_text.edit_separator()
         self.reply_text.delete("1.0", tk.END)
         self.reply_text.insert("1.0", text)
+        self.reply_text.edit_separator()
+
+    def _save_draft(self, reply_body):
+        from outlook_client import create_draft_reply
 
-    def _save_draft(self):
         if not self.current_emails:
             self._set_status("No email selected")
             return
 
-        reply_body = self.reply_text.get("1.0", tk.END).strip()
         if not reply_body:
             self._set_status("No reply to save")
             return
@@ -570,7 +908,7 @@ class OritDvaApp:
             success = create_draft_reply(email["entry_id"], reply_body)
             if success:
                 self._set_status("✅ Draft saved to Outlook!")
-                self.root.after(0, self._next_email)
+                self._call_in_ui(self._next_email)
             else:
                 self._set_status("❌ Could not save draft")
         except Exception as e:
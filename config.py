@@ -11,6 +11,10 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 OUTLOOK_FOLDER = os.getenv("OUTLOOK_FOLDER", "Inbox")
 STYLE_SAMPLES_DIR = os.getenv("STYLE_SAMPLES_DIR", "./samples")
 STYLE_PROFILE_PATH = os.getenv("STYLE_PROFILE_PATH", "./style_profile.json")
+REPLY_CACHE_DIR = os.getenv("REPLY_CACHE_DIR", "./.cache/replies")
 
 # Gemini model to use
 GEMINI_MODEL = "gemini-2.0-flash"
+
+# Gemini embedding model used to spot near-duplicate emails in the reply cache
+GEMINI_EMBED_MODEL = "text-embedding-004"
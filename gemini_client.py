@@ -0,0 +1,37 @@
+"""
+Gemini Client - Shares one genai.Client per API key across the app.
+
+Creating a client sets up auth and a fresh HTTP connection pool, so callers
+reuse the same instance instead of building one per request.
+"""
+import threading
+
+import config
+
+# Request timeout for Gemini calls, in milliseconds
+REQUEST_TIMEOUT_MS = 60_000
+
+_lock = threading.Lock()
+_client = None
+_client_key = None
+
+
+def get_client(api_key: str = None):
+    """Return the shared Gemini client, creating it if the API key changed."""
+    global _client, _client_key
+
+    api_key = api_key or config.GEMINI_API_KEY
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not set. Please add it to your .env file.")
+
+    with _lock:
+        if _client is None or _client_key != api_key:
+            from google import genai
+            from google.genai import types
+
+            _client = genai.Client(
+                api_key=api_key,
+                http_options=types.HttpOptions(timeout=REQUEST_TIMEOUT_MS),
+            )
+            _client_key = api_key
+        return _client
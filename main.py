@@ -12,11 +12,22 @@ Usage:
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import config
 from style_extractor import extract_style, load_style_profile
-from outlook_client import get_unread_emails, create_draft_reply, list_folders, export_emails_from_sender
-from response_generator import generate_reply_interactive
+from outlook_client import (
+    get_unread_emails, list_folders, export_emails_from_sender, DraftWriter, PREVIEW_TABLE,
+)
+from response_generator import (
+    generate_reply, generate_reply_interactive, create_style_cache, delete_style_cache,
+)
+from response_cache import (
+    make_key, get_cached_reply, store_reply, find_similar_reply, remember_reply,
+)
+
+# Max Gemini requests drafted in parallel by 'respond'
+MAX_PARALLEL_REPLIES = 8
 
 
 def cmd_collect():
@@ -79,7 +90,10 @@ def cmd_check():
     """List unread emails without generating replies."""
     print(f"📬 Checking unread emails in '{config.OUTLOOK_FOLDER}'...\n")
 
-    emails = get_unread_emails(max_count=10)
+    emails = get_unread_emails(
+        max_count=10,
+        fields={"subject", "sender_name", "sender_email", "received_time"},
+    )
 
     if not emails:
         print("  No unread emails found. 🎉")
@@ -90,11 +104,38 @@ def cmd_check():
         print(f"  {i}. From: {email['sender_name']} <{email['sender_email']}>")
         print(f"     Subject: {email['subject']}")
         print(f"     Received: {email['received_time']}")
-        preview = email['body'][:80].replace('\n', ' ').replace('\r', '')
+        preview = email['body'][:80].translate(PREVIEW_TABLE)
         print(f"     Preview: {preview}...")
         print()
 
 
+def _reply_cache_key(email: dict, style_profile: dict) -> str:
+    return make_key(email['subject'], email['body'], email['sender_name'], "", style_profile)
+
+
+def _draft_reply(email: dict, style_profile: dict, cached_content: str = None) -> tuple[str, bool]:
+    """
+    Draft a reply for an email, reusing one cached by an earlier run for the
+    same email or, failing that, for a near-duplicate from the same sender.
+    Returns (reply, cached) where cached is True for an exact cache hit.
+    """
+    key = _reply_cache_key(email, style_profile)
+    reply = get_cached_reply(key)
+    if reply is not None:
+        return reply, True
+    reply = find_similar_reply(email['body'], email['sender_name'], style_profile)
+    if reply is None:
+        reply = generate_reply(
+            email_subject=email['subject'],
+            email_body=email['body'],
+            sender_name=email['sender_name'],
+            style_profile=style_profile,
+            cached_content=cached_content,
+        )
+        store_reply(key, reply)
+    return reply, False
+
+
 def cmd_respond():
     """Process unread emails: generate replies and save as drafts."""
     # Ensure style profile exists
@@ -113,32 +154,79 @@ def cmd_respond():
         return
 
     print(f"  Found {len(emails)} unread email(s) to process.\n")
+    print(f"🤖 Drafting {len(emails)} replies in the background...")
 
-    for i, email in enumerate(emails, 1):
-        print(f"\n{'='*60}")
-        print(f"  [{i}/{len(emails)}]")
+    # The system prompt is identical for every email, so cache it once for the batch
+    style_cache = create_style_cache(style_profile)
 
-        reply_text = generate_reply_interactive(
-            email_subject=email['subject'],
-            email_body=email['body'],
-            sender_name=email['sender_name'],
-            style_profile=style_profile,
-        )
+    # Gemini calls run in parallel; review starts as soon as the first draft is ready.
+    # Approved replies are saved to Outlook in the background while review continues.
+    draft_writer = DraftWriter()
+    try:
+        _review_drafts(emails, style_profile, style_cache, draft_writer)
+    finally:
+        if style_cache:
+            delete_style_cache(style_cache)
 
-        if reply_text:
-            success = create_draft_reply(email['entry_id'], reply_text)
-            if success:
-                print("  ✅ Draft saved to Outlook Drafts folder!")
-            else:
-                print("  ⚠ Could not save draft. Reply text:")
-                print(reply_text)
-        else:
-            print("  ⏭ Skipped.")
+    print()
+    for line in draft_writer.log:
+        print(line)
+
+    for entry_id, reply_text in draft_writer.failed:
+        print("\n  ⚠ Could not save draft. Reply text:")
+        print(reply_text)
 
     print(f"\n{'='*60}")
     print("✅ Done! Check your Outlook Drafts folder for review.")
 
 
+def _review_drafts(emails: list, style_profile: dict, style_cache: str, draft_writer: DraftWriter):
+    """Draft replies in the background and walk the user through them in order."""
+    index_log = []
+    with (
+        draft_writer,
+        ThreadPoolExecutor(max_workers=min(len(emails), MAX_PARALLEL_REPLIES)) as executor,
+        ThreadPoolExecutor(max_workers=1) as indexer,
+    ):
+        drafts = [
+            executor.submit(_draft_reply, email, style_profile, style_cache) for email in emails
+        ]
+
+        for i, (email, draft) in enumerate(zip(emails, drafts), 1):
+            print(f"\n{'='*60}")
+            print(f"  [{i}/{len(emails)}]")
+
+            try:
+                draft_text, cached = draft.result()
+            except Exception as e:
+                print(f"  ⚠ Could not draft a reply in advance: {e}")
+                draft_text, cached = None, False
+
+            reply_text = generate_reply_interactive(
+                email_subject=email['subject'],
+                email_body=email['body'],
+                sender_name=email['sender_name'],
+                style_profile=style_profile,
+                draft=draft_text,
+                cached_content=style_cache,
+            )
+
+            if reply_text:
+                # Remember the accepted version so a re-run offers it again
+                store_reply(_reply_cache_key(email, style_profile), reply_text)
+                if not (cached and reply_text == draft_text):
+                    # Embedding is a network call: index in the background, not between prompts
+                    indexer.submit(remember_reply, email['body'], email['sender_name'],
+                                   style_profile, reply_text, index_log.append)
+                draft_writer.submit(email['entry_id'], reply_text)
+                print("  📤 Queued to save to Outlook.")
+            else:
+                print("  ⏭ Skipped.")
+
+    for line in index_log:
+        print(line)
+
+
 def cmd_folders():
     """List available Outlook mail folders."""
     print("📁 Available Outlook folders:\n")
@@ -156,8 +244,8 @@ def cmd_test():
         print("  ❌ GEMINI_API_KEY not set in .env")
     else:
         try:
-            from google import genai
-            client = genai.Client(api_key=config.GEMINI_API_KEY)
+            from gemini_client import get_client
+            client = get_client()
             response = client.models.generate_content(
                 model=config.GEMINI_MODEL,
                 contents="Say 'Hello' in one word."
@@ -4,61 +4,339 @@ Outlook Client - Reads emails from Outlook and creates draft replies.
 Uses win32com to interact with the locally installed Microsoft Outlook application.
 """
 import os
+import queue
 import re
+import threading
+import time
+from itertools import islice
 import pythoncom
 import win32com.client
 
 import config
 
 
+# Characters Windows doesn't allow in file names
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Flattens line breaks for one-line body previews
+PREVIEW_TABLE = str.maketrans({"\n": " ", "\r": None})
+
+# COM objects belong to the thread (apartment) that created them, so the
+# Outlook handles are cached per thread rather than shared module-wide.
+_com = threading.local()
+
+# Bumped by reset_outlook() so every thread reconnects, not just the caller
+_outlook_generation = 0
+
+
 def get_outlook():
-    """Get a reference to the running Outlook application."""
-    pythoncom.CoInitialize()
+    """Get a reference to the running Outlook application (cached per thread)."""
+    if getattr(_com, "generation", None) != _outlook_generation:
+        _clear_handles()
+        _com.generation = _outlook_generation
+
+    outlook = getattr(_com, "outlook", None)
+    if outlook is not None:
+        return outlook
+
+    if not getattr(_com, "initialized", False):
+        pythoncom.CoInitialize()
+        _com.initialized = True
     try:
         outlook = win32com.client.Dispatch("Outlook.Application")
-        return outlook
     except Exception as e:
         raise ConnectionError(
             f"Could not connect to Outlook. Make sure Outlook is running.\n"
             f"Error: {e}"
         )
+    _com.outlook = outlook
+    return outlook
 
 
 def get_namespace(outlook):
     """Get the MAPI namespace for mailbox access."""
-    return outlook.GetNamespace("MAPI")
+    namespace = getattr(_com, "namespace", None)
+    if namespace is None:
+        namespace = _com.namespace = outlook.GetNamespace("MAPI")
+    return namespace
+
+
+def get_inbox(namespace):
+    """Get the default Inbox folder (6 = olFolderInbox)."""
+    inbox = getattr(_com, "inbox", None)
+    if inbox is None:
+        inbox = _com.inbox = namespace.GetDefaultFolder(6)
+    return inbox
+
 
+# Bumped by refresh_folders() so every thread drops its resolved folders
+_folders_generation = 0
 
-def get_unread_emails(folder_name: str = None, max_count: int = 10) -> list[dict]:
+
+def _folder_cache() -> dict:
+    """This thread's lower-cased folder name -> folder object cache."""
+    if getattr(_com, "folders", None) is None or _com.folders_generation != _folders_generation:
+        _com.folders = {}
+        _com.folders_generation = _folders_generation
+    return _com.folders
+
+
+def get_folder(namespace, folder_name: str):
+    """
+    Resolve a folder name to an Outlook folder (cached per thread).
+    
+    "Inbox" and "Sent"/"Sent Items" map to the default folders; any other
+    name is looked up among the Inbox's subfolders (case-insensitively).
+    """
+    folders = _folder_cache()
+    key = folder_name.lower()
+    folder = folders.get(key)
+    if folder is not None:
+        return folder
+
+    if key == "inbox":
+        folder = get_inbox(namespace)
+    elif key in ("sent", "sent items"):
+        folder = namespace.GetDefaultFolder(5)  # 5 = olFolderSentMail
+    else:
+        # Try to find the folder by name under Inbox
+        inbox = get_inbox(namespace)
+        try:
+            folder = inbox.Folders[folder_name]
+        except Exception:
+            raise ValueError(
+                f"Folder '{folder_name}' not found. Available folders: "
+                f"{[f.Name for f in inbox.Folders]}"
+            )
+    folders[key] = folder
+    return folder
+
+
+def _clear_handles():
+    _com.outlook = None
+    _com.namespace = None
+    _com.inbox = None
+    _com.folders = None
+
+
+def reset_outlook():
+    """
+    Drop the cached Outlook handles (e.g. after Outlook was restarted).
+    
+    Other threads drop theirs on their next get_outlook() call.
+    """
+    global _outlook_generation
+
+    _outlook_generation += 1
+    _clear_handles()
+
+
+def close_outlook():
+    """Release this thread's Outlook handles and COM apartment (call before the thread exits)."""
+    _clear_handles()
+    if getattr(_com, "initialized", False):
+        pythoncom.CoUninitialize()
+        _com.initialized = False
+
+
+def _format_time(value) -> str:
+    """Format an Outlook (pywintypes) datetime as 'YYYY-MM-DD HH:MM:SS'."""
+    try:
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    except AttributeError:
+        return str(value)
+
+
+def _item_sender_email(item) -> str:
+    """Sender SMTP address of a mail item, resolving Exchange senders."""
+    try:
+        if item.SenderEmailType == "EX":
+            return item.Sender.GetExchangeUser().PrimarySmtpAddress
+        return item.SenderEmailAddress
+    except Exception:
+        return item.SenderEmailAddress or ""
+
+
+# Header fields returned for each email, in dict order. Each maps to the
+# Folder.GetTable() columns it needs, how to build it from a table row, and
+# how to read it from a mail item. Body can't be read from a table, so it is
+# fetched separately only for the rows actually returned.
+_NO_SUBJECT = "(No Subject)"
+_PR_SENDER_SMTP_ADDRESS = "http://schemas.microsoft.com/mapi/proptag/0x5D01001F"
+_HEADER_FIELDS = {
+    "entry_id": (
+        ("EntryID",),
+        lambda row: row["EntryID"],
+        lambda item: item.EntryID,
+    ),
+    "subject": (
+        ("Subject",),
+        lambda row: row["Subject"] or _NO_SUBJECT,
+        lambda item: item.Subject or _NO_SUBJECT,
+    ),
+    "sender_name": (
+        ("SenderName",),
+        lambda row: row["SenderName"] or "Unknown",
+        lambda item: item.SenderName or "Unknown",
+    ),
+    "sender_email": (
+        # PR_SENDER_SMTP_ADDRESS holds the SMTP address even for Exchange senders
+        ("SenderEmailAddress", _PR_SENDER_SMTP_ADDRESS),
+        lambda row: row[_PR_SENDER_SMTP_ADDRESS] or row["SenderEmailAddress"] or "",
+        _item_sender_email,
+    ),
+    "received_time": (
+        ("ReceivedTime",),
+        lambda row: _format_time(row["ReceivedTime"]),
+        lambda item: _format_time(item.ReceivedTime),
+    ),
+    "conversation_id": (
+        ("ConversationID",),
+        lambda row: row["ConversationID"] or "",
+        lambda item: getattr(item, "ConversationID", ""),
+    ),
+}
+HEADER_FIELDS = frozenset(_HEADER_FIELDS)
+
+
+def _open_table(folder, restriction: str, fields=HEADER_FIELDS):
+    """
+    Open a folder table (newest first) with the columns needed for fields.
+    
+    Returns the table and a generator reading its rows as header dicts.
+    """
+    wanted = [name for name in _HEADER_FIELDS if name in fields]
+    columns = [column for name in wanted for column in _HEADER_FIELDS[name][0]]
+
+    table = folder.GetTable(restriction) if restriction else folder.GetTable()
+    table.Columns.RemoveAll()
+    for column in columns:
+        table.Columns.Add(column)
+    table.Sort("[ReceivedTime]", True)
+
+    def rows():
+        while not table.EndOfTable:
+            row = dict(zip(columns, table.GetNextRow().GetValues()))
+            yield {name: _HEADER_FIELDS[name][1](row) for name in wanted}
+
+    return table, rows()
+
+
+def _read_table(folder, restriction: str, max_count: int, fields=HEADER_FIELDS) -> list[dict]:
+    """Read up to max_count message headers (newest first) from a folder table."""
+    _, rows = _open_table(folder, restriction, fields)
+    return list(islice(rows, max_count))
+
+
+def _iter_item_emails(items, wanted: list[str], include_body: bool):
+    """Yield an email dict per mail item, skipping items that can't be read."""
+    # GetFirst/GetNext walk the collection on Outlook's side, which is
+    # cheaper than iterating it through the Python COM enumerator
+    item = items.GetFirst()
+    while item is not None:
+        try:
+            email = {name: _HEADER_FIELDS[name][2](item) for name in wanted}
+            if include_body:
+                email["body"] = item.Body or ""
+        except Exception as e:
+            print(f"  ⚠ Could not read message: {e}")
+        else:
+            yield email
+        item = items.GetNext()
+
+
+def _iter_sender_items(items, sender_key: str, fields):
+    """
+    Walk mail items for a full-scan export, yielding per item: a header dict
+    if it was sent by sender_key (a casefolded SMTP address), None if it
+    wasn't, or the exception if it couldn't be read.
+    
+    The sender is read first, so other senders' items cost a single lookup.
+    Matching dicts carry the item itself under "_item", so its body can be
+    read later without looking the item up again by EntryID.
+    """
+    wanted = [name for name in _HEADER_FIELDS if name in fields and name != "sender_email"]
+    item = items.GetFirst()
+    while item is not None:
+        try:
+            sender = _item_sender_email(item) or ""
+            if sender.casefold() == sender_key:
+                result = {name: _HEADER_FIELDS[name][2](item) for name in wanted}
+                result["sender_email"] = sender
+                result["_item"] = item
+            else:
+                result = None
+        except Exception as e:
+            result = e
+        yield result
+        item = items.GetNext()
+
+
+def _export_body(namespace, email: dict) -> str | None:
+    """
+    Full body of an email being exported, or None if it is too short to be
+    worth keeping as a writing sample.
+    
+    Decided from the body itself: a table's PR_BODY is cut off and may strip
+    to nothing even when the message is long. The item is reused if the scan
+    already has it (see _iter_sender_items).
+    """
+    item = email.get("_item") or namespace.GetItemFromID(email["entry_id"])
+    body = item.Body or ""
+    if len(body.strip()) < 20:
+        return None
+    return body
+
+
+def _attach_bodies(namespace, emails: list[dict]) -> None:
+    """Fetch the plain text body for each email dict in place."""
+    for email in emails:
+        try:
+            email["body"] = namespace.GetItemFromID(email["entry_id"]).Body or ""
+        except Exception as e:
+            print(f"  ⚠ Could not read message body: {e}")
+            email["body"] = ""
+
+
+def get_unread_emails(
+    folder_name: str = None,
+    max_count: int = 10,
+    include_body: bool = True,
+    fields=None,
+) -> list[dict]:
     """
     Fetch unread emails from the specified Outlook folder.
     
-    Returns a list of dicts with keys:
+    `fields` limits which header keys (see HEADER_FIELDS) are read from
+    Outlook; by default all of them are. Returns a list of dicts with keys:
       - entry_id: unique Outlook identifier for the email
       - subject: email subject line
       - sender_name: display name of the sender
       - sender_email: email address of the sender
       - received_time: when the email was received
-      - body: plain text body of the email
+      - body: plain text body of the email (omitted when include_body is False;
+        fetch it later with get_email_body)
       - conversation_id: for threading
     """
     folder_name = folder_name or config.OUTLOOK_FOLDER
     outlook = get_outlook()
     namespace = get_namespace(outlook)
+    folder = get_folder(namespace, folder_name)
 
-    # Get the default Inbox folder (6 = olFolderInbox)
-    if folder_name.lower() == "inbox":
-        folder = namespace.GetDefaultFolder(6)
+    fields = HEADER_FIELDS if fields is None else frozenset(fields)
+    wanted = [name for name in _HEADER_FIELDS if name in fields]
+
+    # Fast path: read the header columns of each row in a single call
+    # (the EntryID is needed to fetch bodies afterwards)
+    table_fields = fields | {"entry_id"} if include_body else fields
+    try:
+        emails = _read_table(folder, "[Unread] = True", max_count, table_fields)
+    except Exception as e:
+        print(f"  ⚠ Table query failed ({e}), reading messages one by one")
     else:
-        # Try to find the folder by name under Inbox
-        inbox = namespace.GetDefaultFolder(6)
-        try:
-            folder = inbox.Folders[folder_name]
-        except Exception:
-            raise ValueError(
-                f"Folder '{folder_name}' not found. Available folders: "
-                f"{[f.Name for f in inbox.Folders]}"
-            )
+        if include_body:
+            _attach_bodies(namespace, emails)
+        return emails
 
     # Filter unread messages
     messages = folder.Items
@@ -67,37 +345,7 @@ def get_unread_emails(folder_name: str = None, max_count: int = 10) -> list[dict
     unread_filter = "[Unread] = True"
     filtered = messages.Restrict(unread_filter)
 
-    emails = []
-    count = 0
-    for item in filtered:
-        if count >= max_count:
-            break
-        try:
-            # Try to get the actual email address
-            sender_email = ""
-            try:
-                if item.SenderEmailType == "EX":
-                    sender_email = item.Sender.GetExchangeUser().PrimarySmtpAddress
-                else:
-                    sender_email = item.SenderEmailAddress
-            except Exception:
-                sender_email = item.SenderEmailAddress or ""
-
-            emails.append({
-                "entry_id": item.EntryID,
-                "subject": item.Subject or "(No Subject)",
-                "sender_name": item.SenderName or "Unknown",
-                "sender_email": sender_email,
-                "received_time": str(item.ReceivedTime),
-                "body": item.Body or "",
-                "conversation_id": getattr(item, "ConversationID", ""),
-            })
-            count += 1
-        except Exception as e:
-            print(f"  ⚠ Could not read message: {e}")
-            continue
-
-    return emails
+    return list(islice(_iter_item_emails(filtered, wanted, include_body), max_count))
 
 
 def get_recent_emails(folder_name: str = None, max_count: int = 10) -> list[dict]:
@@ -108,63 +356,63 @@ def get_recent_emails(folder_name: str = None, max_count: int = 10) -> list[dict
     folder_name = folder_name or config.OUTLOOK_FOLDER
     outlook = get_outlook()
     namespace = get_namespace(outlook)
+    folder = get_folder(namespace, folder_name)
 
-    if folder_name.lower() == "inbox":
-        folder = namespace.GetDefaultFolder(6)
-    elif folder_name.lower() == "sent" or folder_name.lower() == "sent items":
-        folder = namespace.GetDefaultFolder(5)  # 5 = olFolderSentMail
+    try:
+        emails = _read_table(folder, "", max_count, HEADER_FIELDS - {"conversation_id"})
+    except Exception as e:
+        print(f"  ⚠ Table query failed ({e}), reading messages one by one")
     else:
-        inbox = namespace.GetDefaultFolder(6)
-        try:
-            folder = inbox.Folders[folder_name]
-        except Exception:
-            raise ValueError(f"Folder '{folder_name}' not found.")
+        _attach_bodies(namespace, emails)
+        return emails
 
     messages = folder.Items
     messages.Sort("[ReceivedTime]", True)
 
-    emails = []
-    count = 0
-    for item in messages:
-        if count >= max_count:
-            break
-        try:
-            emails.append({
-                "entry_id": item.EntryID,
-                "subject": item.Subject or "(No Subject)",
-                "sender_name": item.SenderName or "Unknown",
-                "sender_email": getattr(item, "SenderEmailAddress", ""),
-                "received_time": str(item.ReceivedTime),
-                "body": item.Body or "",
-            })
-            count += 1
-        except Exception as e:
-            print(f"  ⚠ Could not read message: {e}")
-            continue
+    wanted = [name for name in _HEADER_FIELDS if name != "conversation_id"]
+    return list(islice(_iter_item_emails(messages, wanted, include_body=True), max_count))
+
+
+def get_email_body(entry_id: str) -> str:
+    """Fetch the plain text body of a single email by its EntryID."""
+    outlook = get_outlook()
+    namespace = get_namespace(outlook)
+    try:
+        return namespace.GetItemFromID(entry_id).Body or ""
+    except Exception:
+        reset_outlook()  # the connection may be dead; reconnect on the next call
+        raise
 
-    return emails
 
+def _build_reply(namespace, entry_id: str, reply_body: str):
+    """Create an unsaved reply to the email identified by entry_id; returns (original, reply)."""
+    # Get the original email by its EntryID
+    original = namespace.GetItemFromID(entry_id)
 
-def create_draft_reply(entry_id: str, reply_body: str) -> bool:
+    # Create a reply
+    reply = original.Reply()
+
+    # Set the body — preserve the original conversation below
+    # (read once: the quoted history can be large to marshal over COM)
+    quoted = reply.Body or ""
+    reply.Body = f"{reply_body}\n\n{quoted}"
+    return original, reply
+
+
+def create_draft_reply(entry_id: str, reply_body: str, namespace=None) -> bool:
     """
     Create a draft reply to the email identified by entry_id.
     The reply is saved as a Draft — NOT sent automatically.
     
+    Batch callers can pass the MAPI namespace they already hold.
     Returns True on success, False on failure.
     """
-    outlook = get_outlook()
-    namespace = get_namespace(outlook)
+    if namespace is None:
+        namespace = get_namespace(get_outlook())
 
     try:
-        # Get the original email by its EntryID
-        original = namespace.GetItemFromID(entry_id)
-
-        # Create a reply
-        reply = original.Reply()
-        
-        # Set the body — preserve the original conversation below
-        reply.Body = reply_body + "\n\n" + reply.Body
-        
+        original, reply = _build_reply(namespace, entry_id, reply_body)
+
         # Save as draft (do NOT send)
         reply.Save()
 
@@ -172,26 +420,169 @@ def create_draft_reply(entry_id: str, reply_body: str) -> bool:
         return True
 
     except Exception as e:
+        reset_outlook()  # the connection may be dead; reconnect on the next call
         print(f"  ✗ Failed to create draft reply: {e}")
         return False
 
 
+def create_draft_replies(replies: list[tuple[str, str]], log=print) -> list[bool]:
+    """
+    Create draft replies for several (entry_id, reply_body) pairs over one
+    Outlook connection. Returns whether each draft was saved, in order.
+    
+    All originals are resolved and their replies built first, then the
+    drafts are saved together. Progress lines are passed to log.
+    """
+    saved = [False] * len(replies)
+    try:
+        namespace = get_namespace(get_outlook())
+    except Exception as e:
+        reset_outlook()
+        log(f"  ✗ Failed to create draft replies: {e}")
+        return saved
+
+    drafts = []
+    for i, (entry_id, reply_body) in enumerate(replies):
+        try:
+            drafts.append((i, *_build_reply(namespace, entry_id, reply_body)))
+        except Exception as e:
+            log(f"  ✗ Failed to create draft reply: {e}")
+
+    for i, original, reply in drafts:
+        try:
+            reply.Save()  # save as draft (do NOT send)
+            log(f"  ✓ Draft reply created for: {original.Subject}")
+            saved[i] = True
+        except Exception as e:
+            log(f"  ✗ Failed to create draft reply: {e}")
+
+    if not all(saved):
+        reset_outlook()  # the connection may be dead; reconnect on the next call
+    return saved
+
+
+class DraftWriter:
+    """
+    Saves draft replies on a background thread so the caller doesn't wait on Outlook.
+    
+    The thread has its own COM apartment and Outlook connection. Call close()
+    (or use it as a context manager) to wait for pending drafts; replies that
+    could not be saved are collected in `failed` as (entry_id, reply_body).
+    Nothing is printed from the thread (it would interleave with the caller's
+    prompts); progress lines are collected in `log` instead.
+    """
+
+    def __init__(self):
+        self.failed = []
+        self.log = []
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, entry_id: str, reply_body: str) -> None:
+        """Queue a draft reply to be saved."""
+        self._jobs.put((entry_id, reply_body))
+
+    def close(self) -> list[tuple[str, str]]:
+        """Wait for all queued drafts to be saved and return the failures."""
+        self._jobs.put(None)
+        self._thread.join()
+        return self.failed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        try:
+            done = False
+            while not done:
+                # Save whatever has queued up since the last pass in one batch
+                batch = [self._jobs.get()]
+                while True:
+                    try:
+                        batch.append(self._jobs.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    done = True
+                    batch = [job for job in batch if job is not None]
+                if batch:
+                    for job, saved in zip(batch, create_draft_replies(batch, self.log.append)):
+                        if not saved:
+                            self.failed.append(job)
+        finally:
+            close_outlook()
+
+
+# Max exported files waiting for the background writers
+WRITE_QUEUE_SIZE = 32
+# Background threads writing exported files
+EXPORT_WRITERS = 4
+
+
+def _write_files(jobs: queue.Queue, failures: list) -> None:
+    """Write (path, bytes) jobs from the queue until a None sentinel arrives."""
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        path, data = job
+        try:
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            failures.append((path, e))
+
+
+# Header fields read for each exported email
+_EXPORT_FIELDS = frozenset(
+    {"entry_id", "subject", "sender_name", "sender_email", "received_time"}
+)
+
+
+def _jet_quote(value: str) -> str:
+    """Escape a value for use inside a quoted Restrict() (Jet) filter string."""
+    return value.replace("'", "''")
+
+
+def _resolve_exchange_dn(namespace, smtp_address: str) -> str:
+    """
+    Resolve an SMTP address to its Exchange (X.500) address, if it has one.
+    
+    Returns an empty string for non-Exchange or unresolvable addresses.
+    """
+    try:
+        recipient = namespace.CreateRecipient(smtp_address)
+        if recipient.Resolve():
+            entry = recipient.AddressEntry
+            if entry is not None and entry.Type == "EX":
+                return entry.Address or ""
+    except Exception:
+        pass
+    return ""
+
+
 def export_emails_from_sender(
     sender_email: str,
     output_dir: str = None,
     max_count: int = 100,
+    stop: threading.Event = None,
 ) -> int:
     """
     Export emails received FROM a specific sender to text files for style analysis.
     
-    Uses Outlook's Restrict() filter for fast server-side filtering, then
-    falls back to full scan if the filter returns no results (e.g. Exchange
-    addresses that don't match the SMTP filter).
+    Uses Outlook's Restrict() filter for fast server-side filtering (by SMTP
+    or Exchange address, then by the sender's SMTP address property), and
+    falls back to a full scan only if neither filter finds anything.
     
     Args:
         sender_email: The email address to filter by (e.g. "boris@example.com")
         output_dir: Directory to save the text files (defaults to STYLE_SAMPLES_DIR)
         max_count: Maximum number of emails to export
+        stop: Optional event; once set, the scan stops after the current email
     
     Returns:
         Number of emails exported
@@ -207,10 +598,11 @@ def export_emails_from_sender(
     # Search in Inbox (6 = olFolderInbox)
     print(f"  [2/5] Opening Inbox folder...")
     try:
-        inbox = namespace.GetDefaultFolder(6)
+        inbox = get_inbox(namespace)
         all_messages = inbox.Items
         total_inbox = all_messages.Count
     except Exception as e:
+        reset_outlook()  # reconnect from scratch on the next attempt
         error_msg = str(e)
         print(f"\n  ❌ Could not open Outlook Inbox!")
         print(f"  Error: {error_msg}")
@@ -225,33 +617,58 @@ def export_emails_from_sender(
         return 0
     print(f"  [2/5] ✅ Inbox has {total_inbox} total emails")
 
-    sender_lower = sender_email.lower().strip()
+    sender_key = sender_email.strip().casefold()
 
     # --- Try fast Restrict() filter first ---
+    # Exchange senders are stored by their X.500 address, so resolve it once
+    # and match both forms server-side instead of checking every item.
     print(f"  [3/5] Filtering emails from '{sender_email}'...")
+    exchange_dn = _resolve_exchange_dn(namespace, sender_email)
+    addresses = [sender_email.strip()] + ([exchange_dn] if exchange_dn else [])
+    restriction = " OR ".join(
+        f"[SenderEmailAddress] = '{_jet_quote(address)}'" for address in addresses
+    )
+    # The table that counts the matches is the one that is read afterwards,
+    # so the filter is only evaluated once
     try:
-        restriction = f"[SenderEmailAddress] = '{sender_email}'"
-        filtered = all_messages.Restrict(restriction)
-        filtered_count = filtered.Count
-        print(f"  [3/5] ✅ Restrict filter found {filtered_count} emails (SMTP match)")
+        table, candidates = _open_table(inbox, restriction, _EXPORT_FIELDS)
+        filtered_count = table.GetRowCount()
+        match_kind = "SMTP/Exchange match" if exchange_dn else "SMTP match"
+        print(f"  [3/5] ✅ Restrict filter found {filtered_count} emails ({match_kind})")
     except Exception as e:
         print(f"  [3/5] ⚠ Restrict filter failed ({e}), will do full scan")
-        filtered_count = 0
-        filtered = None
+        filtered_count = None
 
-    # If filter found results, use them; otherwise fall back to full scan
-    if filtered_count > 0:
-        messages_to_scan = filtered
+    # Nothing matched and the address didn't resolve: match on the sender's
+    # SMTP address property, which Exchange stores alongside the X.500 one
+    if filtered_count == 0 and not exchange_dn:
+        restriction = (
+            f'@SQL="{_PR_SENDER_SMTP_ADDRESS}" = \'{_jet_quote(sender_email.strip())}\''
+        )
+        try:
+            table, candidates = _open_table(inbox, restriction, _EXPORT_FIELDS)
+            filtered_count = table.GetRowCount()
+            print(f"  [3/5] ✅ SMTP property filter found {filtered_count} emails")
+        except Exception as e:
+            print(f"  [3/5] ⚠ SMTP property filter failed ({e})")
+            filtered_count = None
+
+    # Use the filter unless it failed, or found nothing without covering Exchange addresses
+    if filtered_count is not None and (filtered_count > 0 or exchange_dn):
+        # Matching headers come back in batches from the table; only the body
+        # is read per item, and only for emails that are actually exported
         scan_count = filtered_count
-        use_filter = True
     else:
         # Fall back — might be Exchange addresses  
         print(f"  [3/5] ℹ No SMTP matches, falling back to scan (handles Exchange addresses)")
-        messages_to_scan = all_messages
+        all_messages.Sort("[ReceivedTime]", True)  # newest first
+        candidates = _iter_sender_items(all_messages, sender_key, _EXPORT_FIELDS)
         scan_count = total_inbox
-        use_filter = False
 
-    messages_to_scan.Sort("[ReceivedTime]", True)  # newest first
+    # One directory listing instead of a stat() per candidate email
+    # (normcase: file names are case-insensitive on Windows)
+    with os.scandir(output_dir) as entries:
+        existing_files = {os.path.normcase(entry.name) for entry in entries}
 
     exported = 0
     skipped_existing = 0
@@ -261,87 +678,89 @@ def export_emails_from_sender(
 
     print(f"  [4/5] Scanning {scan_count} emails...")
 
-    for item in messages_to_scan:
-        if exported >= max_count:
-            print(f"  [4/5] Reached max count ({max_count}), stopping")
-            break
-
-        scanned += 1
-
-        # Progress indicator every 10 emails (more frequent for visibility)
-        if scanned % 10 == 0:
-            pct = int(scanned / scan_count * 100) if scan_count else 0
-            print(f"  [4/5] ... {scanned}/{scan_count} ({pct}%) — exported: {exported}")
+    write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+    write_failures = []
+    writers = [
+        threading.Thread(target=_write_files, args=(write_queue, write_failures), daemon=True)
+        for _ in range(EXPORT_WRITERS)
+    ]
+    for writer in writers:
+        writer.start()
 
-        try:
-            # If we already used Restrict(), we know the sender matches (for SMTP)
-            # but still need to verify for Exchange addresses in full-scan mode
-            if not use_filter:
-                item_sender = ""
-                try:
-                    if item.SenderEmailType == "EX":
-                        exchg = item.Sender.GetExchangeUser()
-                        if exchg:
-                            item_sender = exchg.PrimarySmtpAddress or ""
-                        else:
-                            item_sender = item.SenderEmailAddress or ""
-                    else:
-                        item_sender = item.SenderEmailAddress or ""
-                except Exception:
-                    item_sender = item.SenderEmailAddress or ""
-
-                if item_sender.lower().strip() != sender_lower:
-                    continue
-
-            subject = item.Subject or "no_subject"
-            body = item.Body or ""
-            received_time = str(item.ReceivedTime)
+    try:
+        for email in candidates:
+            if exported >= max_count:
+                print(f"  [4/5] Reached max count ({max_count}), stopping")
+                break
+            if stop is not None and stop.is_set():
+                print(f"  [4/5] Cancelled")
+                break
 
-            # Skip very short emails
-            if len(body.strip()) < 20:
-                skipped_short += 1
-                continue
+            scanned += 1
 
-            # Create a safe filename
-            safe_subject = re.sub(r'[<>:"/\\|?*]', '_', subject)[:60].strip()
-            safe_time = received_time[:10].replace("-", "")  # YYYYMMDD
-            filename = f"from_{safe_time}_{safe_subject}.txt"
-            filepath = os.path.join(output_dir, filename)
+            # Progress indicator every 10 emails (more frequent for visibility)
+            if scanned % 10 == 0:
+                pct = int(scanned / scan_count * 100) if scan_count else 0
+                print(f"  [4/5] ... {scanned}/{scan_count} ({pct}%) — exported: {exported}")
 
-            # Skip if already exported
-            if os.path.exists(filepath):
-                skipped_existing += 1
-                continue
-
-            # Resolve sender info for the file header
             try:
-                if use_filter:
-                    sender_display = item.SenderEmailAddress or sender_email
-                else:
-                    sender_display = item_sender
-            except Exception:
-                sender_display = sender_email
-
-            # Format the email content
-            content = (
-                f"From: {item.SenderName} <{sender_display}>\n"
-                f"Subject: {subject}\n"
-                f"Received: {received_time}\n"
-                f"{'=' * 50}\n\n"
-                f"{body}\n"
-            )
+                if email is None:
+                    continue  # full scan: sent by someone else
+                if isinstance(email, Exception):
+                    raise email  # full scan: item couldn't be read
+
+                subject = email["subject"]
+                if subject == _NO_SUBJECT:
+                    subject = "no_subject"  # keeps file names of earlier exports
+                received_time = email["received_time"]
+
+                # Create a safe filename
+                safe_subject = _UNSAFE_FILENAME_RE.sub('_', subject)[:60].strip()
+                safe_time = received_time[:10].replace("-", "")
+                filename = f"from_{safe_time}_{safe_subject}.txt"
+                filepath = os.path.join(output_dir, filename)
+
+                # Skip if already exported (checked before fetching the body, which is large)
+                if os.path.normcase(filename) in existing_files:
+                    skipped_existing += 1
+                    continue
 
-            with open(filepath, "w", encoding="utf-8", errors="replace") as f:
-                f.write(content)
+                body = _export_body(namespace, email)
+                if body is None:
+                    skipped_short += 1
+                    continue
 
-            exported += 1
-            print(f"  [4/5] 📄 Saved: {filename}")
+                # Format the email content
+                content = (
+                    f"From: {email['sender_name']} <{email['sender_email'] or sender_email}>\n"
+                    f"Subject: {subject}\n"
+                    f"Received: {received_time}\n"
+                    f"{'=' * 50}\n\n"
+                    f"{body}\n"
+                )
+
+                # Written by the background writers so disk I/O overlaps the COM scan
+                write_queue.put((filepath, content.encode("utf-8", errors="replace")))
+                existing_files.add(os.path.normcase(filename))
+
+                exported += 1
+                print(f"  [4/5] 📄 Saved: {filename}")
+
+            except Exception as e:
+                errors += 1
+                if errors <= 5:  # Only show first 5 errors
+                    print(f"  ⚠ Error on email #{scanned}: {e}")
+                continue
+    finally:
+        for writer in writers:
+            write_queue.put(None)  # one stop sentinel per writer
+        for writer in writers:
+            writer.join()
 
-        except Exception as e:
-            errors += 1
-            if errors <= 5:  # Only show first 5 errors
-                print(f"  ⚠ Error on email #{scanned}: {e}")
-            continue
+    for path, error in write_failures:
+        errors += 1
+        exported -= 1
+        print(f"  ⚠ Could not write {os.path.basename(path)}: {error}")
 
     # Summary
     print(f"\n  [5/5] ─── Collection Summary ───")
@@ -357,16 +776,45 @@ def export_emails_from_sender(
     return exported
 
 
-def list_folders() -> list[str]:
-    """List all available mail folders for the user."""
+# Folder names change rarely, so list_folders() reuses its last result for a while
+FOLDERS_TTL = 60
+_folders_cache = (0.0, None)
+
+
+def list_folders(max_age: float = FOLDERS_TTL) -> list[str]:
+    """
+    List all available mail folders for the user.
+    
+    A listing younger than max_age seconds is returned without asking Outlook
+    again; pass max_age=0 to force a refresh.
+    """
+    global _folders_cache
+
+    fetched_at, folders = _folders_cache
+    if folders is not None and time.monotonic() - fetched_at < max_age:
+        return list(folders)
+
     outlook = get_outlook()
     namespace = get_namespace(outlook)
-    inbox = namespace.GetDefaultFolder(6)
+    inbox = get_inbox(namespace)
 
+    # Keep the folder objects too, so get_folder() can skip the name lookup
     folders = ["Inbox", "Sent Items"]
+    cache = _folder_cache()
     for folder in inbox.Folders:
-        folders.append(folder.Name)
-    return folders
+        name = folder.Name
+        folders.append(name)
+        cache.setdefault(name.lower(), folder)
+    _folders_cache = (time.monotonic(), folders)
+    return list(folders)
+
+
+def refresh_folders() -> None:
+    """Forget cached folder names and folder objects (e.g. after folders were added or renamed)."""
+    global _folders_cache, _folders_generation
+
+    _folders_cache = (0.0, None)
+    _folders_generation += 1
 
 
 if __name__ == "__main__":
@@ -387,7 +835,7 @@ if __name__ == "__main__":
                 print(f"\n  From: {email['sender_name']} <{email['sender_email']}>")
                 print(f"  Subject: {email['subject']}")
                 print(f"  Received: {email['received_time']}")
-                preview = email['body'][:100].replace('\n', ' ')
+                preview = email['body'][:100].translate(PREVIEW_TABLE)
                 print(f"  Preview: {preview}...")
 
     except Exception as e:
@@ -0,0 +1,209 @@
+"""
+Response Cache - Keeps generated replies on disk so repeat requests skip Gemini.
+
+Each reply is stored as a small JSON file named after a hash of everything that
+shapes the output: the email, the extra instructions, the style profile and the model.
+
+A second, similarity-based tier keeps an embedding of each answered email so a
+near-duplicate email from the same sender can reuse the earlier reply.
+"""
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from functools import lru_cache
+
+import config
+
+# Cached replies older than this are ignored and regenerated
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Minimum cosine similarity for an earlier reply to be reused for a new email
+SIMILARITY_THRESHOLD = 0.92
+SIMILARITY_INDEX_FILE = "similar_index.jsonl"
+
+
+def profile_hash(style_profile: dict) -> str:
+    """Stable hash of a style profile (key order doesn't matter)."""
+    data = json.dumps(style_profile, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def make_key(
+    email_subject: str,
+    email_body: str,
+    sender_name: str,
+    additional_context: str,
+    style_profile: dict,
+) -> str:
+    """Build the cache key for a reply request."""
+    parts = [
+        email_subject,
+        email_body,
+        sender_name,
+        additional_context,
+        profile_hash(style_profile),
+        config.GEMINI_MODEL,
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or config.REPLY_CACHE_DIR, f"{key}.json")
+
+
+def get_cached_reply(key: str, cache_dir: str = None, ttl: float = CACHE_TTL_SECONDS) -> str | None:
+    """Return the cached reply for key, or None on a miss or if it has expired."""
+    try:
+        with open(_entry_path(key, cache_dir), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("created", 0) > ttl:
+        return None
+    return entry.get("reply")
+
+
+def store_reply(key: str, reply: str, cache_dir: str = None) -> None:
+    """Save a reply under key. Failures are reported but never raised."""
+    path = _entry_path(key, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"reply": reply, "created": time.time()}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"  ⚠ Could not cache reply: {e}")
+
+
+# ── Similarity tier ──────────────────────────────────────────
+
+_index_lock = threading.Lock()
+_index = None  # list of entries from the index file, loaded on first use
+
+
+@lru_cache(maxsize=64)
+def _embed(text: str) -> tuple[float, ...]:
+    """Unit-length Gemini embedding of text (memoized for the lookup/remember pair)."""
+    from gemini_client import get_client
+
+    result = get_client().models.embed_content(model=config.GEMINI_EMBED_MODEL, contents=text)
+    values = result.embeddings[0].values
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return tuple(v / norm for v in values)
+
+
+def _index_path() -> str:
+    return os.path.join(config.REPLY_CACHE_DIR, SIMILARITY_INDEX_FILE)
+
+
+def _load_index(ttl: float = CACHE_TTL_SECONDS) -> list[dict]:
+    """Load the index on first use, rewriting the file without expired entries."""
+    global _index
+    if _index is None:
+        entries = []
+        expired = False
+        now = time.time()
+        try:
+            with open(_index_path(), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        expired = True  # drop unreadable lines too
+                        continue
+                    if now - entry["created"] > ttl:
+                        expired = True
+                    else:
+                        entries.append(entry)
+        except OSError:
+            pass
+        _index = entries
+        if expired:
+            _write_index(entries)
+    return _index
+
+
+def _write_index(entries: list[dict]) -> None:
+    path = _index_path()
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"  ⚠ Could not prune similarity index: {e}")
+
+
+def find_similar_reply(
+    email_body: str,
+    sender_name: str,
+    style_profile: dict,
+    threshold: float = SIMILARITY_THRESHOLD,
+    ttl: float = CACHE_TTL_SECONDS,
+) -> str | None:
+    """
+    Return an earlier reply to a near-duplicate email from the same sender.
+    
+    Returns None if nothing is similar enough or embeddings are unavailable.
+    """
+    style = profile_hash(style_profile)
+    now = time.time()
+    with _index_lock:
+        candidates = [
+            entry for entry in _load_index()
+            if entry["sender"] == sender_name and entry["profile"] == style
+            and now - entry["created"] <= ttl
+        ]
+    if not candidates:
+        return None  # nothing to compare against, so don't pay for an embedding
+
+    try:
+        query = _embed(email_body)
+    except Exception as e:
+        print(f"  ⚠ Similarity lookup skipped: {e}")
+        return None
+
+    best_score, best_reply = threshold, None
+    for entry in candidates:
+        score = sum(a * b for a, b in zip(query, entry["vector"]))
+        if score >= best_score:
+            best_score, best_reply = score, entry["reply"]
+    return best_reply
+
+
+def remember_reply(email_body: str, sender_name: str, style_profile: dict, reply: str,
+                   log=print) -> None:
+    """Add an answered email to the similarity index. Failures are passed to log, never raised."""
+    try:
+        profile = profile_hash(style_profile)
+        with _index_lock:
+            if any(e["reply"] == reply and e["sender"] == sender_name and e["profile"] == profile
+                   for e in _load_index()):
+                return  # already indexed: don't pay for another embedding
+        entry = {
+            "sender": sender_name,
+            "profile": profile,
+            "created": time.time(),
+            "vector": list(_embed(email_body)),
+            "reply": reply,
+        }
+        with _index_lock:
+            index = _load_index()
+            if any(e["reply"] == reply and e["vector"] == entry["vector"] for e in index):
+                return  # already indexed (e.g. a cached reply accepted again)
+            os.makedirs(config.REPLY_CACHE_DIR, exist_ok=True)
+            live = [e for e in index if entry["created"] - e["created"] <= CACHE_TTL_SECONDS]
+            live.append(entry)
+            if len(live) <= len(index):
+                _write_index(live)  # some entries expired: rewrite without them
+            else:
+                with open(_index_path(), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            index[:] = live
+    except Exception as e:
+        log(f"  ⚠ Could not index reply: {e}")
@@ -5,9 +5,6 @@ Uses the Style Profile + Gemini to craft replies that sound like the user wrote
 """
 import json
 
-from google import genai
-from google.genai import types
-
 import config
 from style_extractor import load_style_profile
 
@@ -37,12 +34,41 @@ No subject line. No "Subject:" prefix. Just the reply text.
 """
 
 
+# Gemini only caches prompts of at least this many tokens
+MIN_CACHE_TOKENS = 4096
+
+# (style profile, rendered prompt) from the last build_system_prompt() call
+_system_prompt_cache = (None, None)
+
+
+def build_system_prompt(style_profile: dict) -> str:
+    """
+    Build the reply system prompt for a style profile.
+    
+    The prompt for the last profile object is kept, so a batch sharing one
+    (unmodified) profile serializes it only once.
+    """
+    global _system_prompt_cache
+
+    profile, prompt = _system_prompt_cache
+    if profile is not style_profile:
+        prompt = REPLY_SYSTEM_PROMPT.format(
+            style_profile=json.dumps(style_profile, indent=2, ensure_ascii=False),
+            formality=style_profile.get("formality_level", 5),
+        )
+        _system_prompt_cache = (style_profile, prompt)
+    return prompt
+
+
 def generate_reply(
     email_subject: str,
     email_body: str,
     sender_name: str,
     additional_context: str = "",
     style_profile: dict = None,
+    client: "genai.Client" = None,
+    cached_content: str = None,
+    on_text=None,
 ) -> str:
     """
     Generate a reply to the given email using the user's style profile.
@@ -53,6 +79,11 @@ def generate_reply(
         sender_name: Name of the person who sent the email
         additional_context: Optional context/instructions for this specific reply
         style_profile: Style profile dict (loaded from disk if not provided)
+        client: Gemini client to use (defaults to the shared one from gemini_client)
+        cached_content: Name of a Gemini context cache holding the system prompt
+            for this style profile (see create_style_cache)
+        on_text: Optional callback; if given, the reply is streamed and each
+            piece of text is passed to it as it arrives
     
     Returns:
         The generated reply text
@@ -64,15 +95,6 @@ def generate_reply(
     if style_profile is None:
         style_profile = load_style_profile()
 
-    formality = style_profile.get("formality_level", 5)
-    profile_json = json.dumps(style_profile, indent=2, ensure_ascii=False)
-
-    # Build system prompt
-    system_prompt = REPLY_SYSTEM_PROMPT.format(
-        style_profile=profile_json,
-        formality=formality,
-    )
-
     # Build user prompt
     user_prompt = f"""Reply to this email:
 
@@ -86,20 +108,96 @@ SUBJECT: {email_subject}
     if additional_context:
         user_prompt += f"\nADDITIONAL CONTEXT/INSTRUCTIONS: {additional_context}\n"
 
-    # Call Gemini
-    client = genai.Client(api_key=config.GEMINI_API_KEY)
+    # Call Gemini (imported here so loading this module stays cheap)
+    from google.genai import errors, types
+    from gemini_client import get_client
+
+    if client is None:
+        client = get_client()
 
-    response = client.models.generate_content(
-        model=config.GEMINI_MODEL,
-        contents=user_prompt,
-        config=types.GenerateContentConfig(
-            system_instruction=system_prompt,
-            temperature=0.7,  # some creativity for natural variation
-            max_output_tokens=2048,
+    def make_request(prompt_config: dict) -> dict:
+        return dict(
+            model=config.GEMINI_MODEL,
+            contents=user_prompt,
+            config=types.GenerateContentConfig(
+                **prompt_config,
+                temperature=0.7,  # some creativity for natural variation
+                max_output_tokens=2048,
+            )
         )
-    )
 
-    return response.text.strip()
+    streamed = []  # text already passed to on_text
+
+    def call(request: dict) -> str:
+        if on_text is None:
+            return client.models.generate_content(**request).text.strip()
+        for chunk in client.models.generate_content_stream(**request):
+            if chunk.text:
+                streamed.append(chunk.text)
+                on_text(chunk.text)
+        return "".join(streamed).strip()
+
+    # The system prompt is the same for every email, so it is either served from
+    # a context cache or sent ahead of the per-email prompt as a stable prefix
+    full_prompt = {"system_instruction": build_system_prompt(style_profile)}
+    if cached_content:
+        try:
+            return call(make_request({"cached_content": cached_content}))
+        except errors.ClientError as e:
+            # Only retry when the cache itself is gone (e.g. it expired during a long
+            # review) and nothing has been shown yet; anything else is a real failure
+            if streamed or not _is_missing_cache_error(e):
+                raise
+            print(f"  ℹ Cached prompt unavailable ({e}), sending the full prompt")
+    return call(make_request(full_prompt))
+
+
+def _is_missing_cache_error(e: Exception) -> bool:
+    """Whether a Gemini ClientError says the referenced context cache no longer exists."""
+    return getattr(e, "code", None) in (400, 403, 404) and "cache" in str(e).lower()
+
+
+def create_style_cache(style_profile: dict, ttl: str = "600s") -> str | None:
+    """
+    Store the system prompt for style_profile in a Gemini context cache.
+    
+    Returns the cache name to pass as cached_content, or None if caching is
+    unavailable or the prompt is too small to be cached.
+    """
+    from google.genai import types
+    from gemini_client import get_client
+
+    system_prompt = build_system_prompt(style_profile)
+    client = get_client()
+    try:
+        # Character counts say little about token counts (Hebrew especially), so ask
+        tokens = client.models.count_tokens(
+            model=config.GEMINI_MODEL, contents=system_prompt,
+        ).total_tokens
+        if tokens < MIN_CACHE_TOKENS:
+            return None  # below the model's minimum cacheable size
+
+        cache = client.caches.create(
+            model=config.GEMINI_MODEL,
+            config=types.CreateCachedContentConfig(
+                system_instruction=system_prompt,
+                ttl=ttl,
+            ),
+        )
+        return cache.name
+    except Exception as e:
+        print(f"  ℹ Prompt caching unavailable, sending the full prompt each time ({e})")
+        return None
+
+
+def delete_style_cache(name: str) -> None:
+    """Delete a context cache created by create_style_cache (errors are ignored)."""
+    from gemini_client import get_client
+
+    try:
+        get_client().caches.delete(name=name)
+    except Exception:
+        pass
 
 
 def generate_reply_interactive(
@@ -107,10 +205,15 @@ def generate_reply_interactive(
     email_body: str,
     sender_name: str,
     style_profile: dict = None,
+    draft: str = None,
+    cached_content: str = None,
 ) -> str:
     """
     Interactive version: shows the email, asks for optional context,
     generates the reply, and lets the user approve or retry.
+
+    If a draft was already generated (e.g. in the background), it is shown
+    straight away instead of asking for instructions first.
     """
     if style_profile is None:
         style_profile = load_style_profile()
@@ -126,22 +229,32 @@ def generate_reply_interactive(
     print(preview)
     print("=" * 60)
 
-    context = input("\n💡 Any specific instructions for this reply? (Enter to skip): ").strip()
+    context = ""
+    if draft is None:
+        context = input("\n💡 Any specific instructions for this reply? (Enter to skip): ").strip()
 
     while True:
-        print("\n🤖 Generating reply...")
-        reply = generate_reply(
-            email_subject=email_subject,
-            email_body=email_body,
-            sender_name=sender_name,
-            additional_context=context,
-            style_profile=style_profile,
-        )
+        if draft is None:
+            print("\n🤖 Generating reply...")
 
         print("\n" + "-" * 60)
         print("📝 DRAFT REPLY:")
         print("-" * 60)
-        print(reply)
+        if draft is not None:
+            reply, draft = draft, None
+            print(reply)
+        else:
+            # Stream the reply so it can be read while it is still being written
+            reply = generate_reply(
+                email_subject=email_subject,
+                email_body=email_body,
+                sender_name=sender_name,
+                additional_context=context,
+                style_profile=style_profile,
+                cached_content=cached_content,
+                on_text=lambda text: print(text, end="", flush=True),
+            )
+            print()
         print("-" * 60)
 
         choice = input("\n[A]ccept / [R]etry / [E]dit instructions / [S]kip? ").strip().upper()
@@ -6,14 +6,21 @@ and stores the extracted stylistic DNA as a local JSON file.
 """
 import json
 import os
-import glob
-
-from google import genai
-from google.genai import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import config
 
 
+# File types loaded as writing samples, and threads reading them
+SAMPLE_EXTENSIONS = (".txt", ".eml", ".msg", ".md", ".html")
+SAMPLE_READERS = 8
+
+# Samples whose text exceeds this many characters (roughly 100k tokens) are
+# analyzed in several parallel Gemini calls and the profiles combined
+MAX_SAMPLES_CHARS = 400_000
+MAX_PARALLEL_ANALYSES = 4
+
 ANALYSIS_PROMPT = """You are a linguistic analyst. Analyze the following writing samples 
 from a single author and produce a comprehensive "Style Profile" in JSON format.
 
@@ -65,26 +72,61 @@ Use this exact structure:
 {samples}
 """
 
+COMBINE_PROMPT = """You are a linguistic analyst. Each of the following Style Profiles
+was produced from a different batch of writing samples by the SAME author.
+Combine them into ONE Style Profile that describes the author across all batches:
+merge the descriptions (don't just pick one), keep the examples and phrases that
+best represent the author, and average the formality_level.
 
-def load_samples(samples_dir: str) -> list[dict]:
-    """Load all text files from the samples directory."""
-    samples = []
-    patterns = ["*.txt", "*.eml", "*.msg", "*.md", "*.html"]
+Return ONLY valid JSON with the same structure as the profiles below.
+No markdown fences. No extra text.
+
+--- STYLE PROFILES ---
+{profiles}
+"""
+
+
+def _find_sample_files(samples_dir: str) -> list[str]:
+    """Paths of all sample files under samples_dir, in one directory walk."""
+    paths = []
+    pending = [samples_dir]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue  # hidden, as glob skips them
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in SAMPLE_EXTENSIONS:
+                        paths.append(entry.path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            print(f"  ⚠ Could not list {directory}: {e}")
+    return sorted(paths)
+
+
+def _read_sample(filepath: str) -> dict | None:
+    try:
+        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            content = f.read().strip()
+    except Exception as e:
+        print(f"  ⚠ Could not read {filepath}: {e}")
+        return None
+    if not content:
+        return None
+    return {"filename": os.path.basename(filepath), "content": content}
 
-    for pattern in patterns:
-        for filepath in glob.glob(os.path.join(samples_dir, "**", pattern), recursive=True):
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read().strip()
-                    if content:
-                        samples.append({
-                            "filename": os.path.basename(filepath),
-                            "content": content
-                        })
-            except Exception as e:
-                print(f"  ⚠ Could not read {filepath}: {e}")
 
-    return samples
+def load_samples(samples_dir: str) -> list[dict]:
+    """Load all text files from the samples directory."""
+    paths = _find_sample_files(samples_dir)
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(paths), SAMPLE_READERS)) as executor:
+        return [sample for sample in executor.map(_read_sample, paths) if sample]
 
 
 def build_samples_text(samples: list[dict]) -> str:
@@ -95,38 +137,27 @@ def build_samples_text(samples: list[dict]) -> str:
     return "\n".join(parts)
 
 
-def extract_style(samples_dir: str = None, output_path: str = None) -> dict:
-    """
-    Main function: reads samples, analyzes with Gemini, saves style profile locally.
-    Returns the style profile dict.
-    """
-    samples_dir = samples_dir or config.STYLE_SAMPLES_DIR
-    output_path = output_path or config.STYLE_PROFILE_PATH
+def _chunk_samples(samples: list[dict]) -> list[list[dict]]:
+    """Split samples into batches whose text stays within MAX_SAMPLES_CHARS."""
+    chunks, chunk, size = [], [], 0
+    for sample in samples:
+        length = len(sample["content"]) + len(sample["filename"])
+        if chunk and size + length > MAX_SAMPLES_CHARS:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(sample)
+        size += length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
 
-    if not config.GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY not set. Please add it to your .env file.")
 
-    # Load writing samples
-    print(f"📂 Loading samples from: {os.path.abspath(samples_dir)}")
-    samples = load_samples(samples_dir)
+def _generate_profile(prompt: str) -> dict:
+    """Ask Gemini for a style profile and parse the JSON it returns."""
+    from google.genai import types
+    from gemini_client import get_client
 
-    if not samples:
-        raise FileNotFoundError(
-            f"No text files found in '{os.path.abspath(samples_dir)}'. "
-            f"Please add .txt, .eml, .msg, .md, or .html files."
-        )
-
-    print(f"  ✓ Loaded {len(samples)} writing samples")
-
-    # Build the prompt
-    samples_text = build_samples_text(samples)
-    prompt = ANALYSIS_PROMPT.format(samples=samples_text)
-
-    # Call Gemini
-    print("🤖 Analyzing writing style with Gemini...")
-    client = genai.Client(api_key=config.GEMINI_API_KEY)
-
-    response = client.models.generate_content(
+    response = get_client().models.generate_content(
         model=config.GEMINI_MODEL,
         contents=prompt,
         config=types.GenerateContentConfig(
@@ -145,28 +176,136 @@ def extract_style(samples_dir: str = None, output_path: str = None) -> dict:
     raw_text = raw_text.strip()
 
     try:
-        style_profile = json.loads(raw_text)
+        return json.loads(raw_text)
     except json.JSONDecodeError as e:
         print(f"  ⚠ Failed to parse Gemini response as JSON: {e}")
         print(f"  Raw response:\n{raw_text[:500]}")
         # Save raw text for debugging
-        style_profile = {"raw_analysis": raw_text, "parse_error": str(e)}
+        return {"raw_analysis": raw_text, "parse_error": str(e)}
+
+
+def _analyze_samples(samples: list[dict]) -> dict:
+    """Ask Gemini for the style profile of a set of samples."""
+    return _generate_profile(ANALYSIS_PROMPT.format(samples=build_samples_text(samples)))
+
+
+def _combine_profiles(profiles: list[dict]) -> dict:
+    """
+    Combine the style profiles of several sample batches into one.
+    
+    Gemini merges them; batches whose response couldn't be parsed are left
+    out. If the combined response can't be parsed either, the profiles'
+    lists are joined and their descriptions concatenated instead.
+    """
+    parsed = [p for p in profiles if "parse_error" not in p]
+    if len(parsed) <= 1:
+        return (parsed or profiles)[0]
+
+    print(f"🤖 Combining {len(parsed)} batch profiles...")
+    combined = _generate_profile(COMBINE_PROMPT.format(
+        profiles=json.dumps(parsed, indent=2, ensure_ascii=False)
+    ))
+    if "parse_error" not in combined:
+        return combined
+    return _merge_profiles(parsed)
+
+
+def _merge_values(values: list):
+    """Combine one profile field across batches without losing any of them."""
+    if all(isinstance(v, list) for v in values):
+        merged = []
+        for value in values:
+            for element in value:
+                if element not in merged:
+                    merged.append(element)
+        return merged
+    if all(isinstance(v, dict) for v in values):
+        return _merge_profiles(values)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return round(sum(values) / len(values))
+    # Free-text descriptions: keep each distinct one
+    texts = []
+    for value in values:
+        text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+        if text not in texts:
+            texts.append(text)
+    return " / ".join(texts)
+
+
+def _merge_profiles(profiles: list[dict]) -> dict:
+    """Merge style profiles field by field (lists joined, numbers averaged, text concatenated)."""
+    merged = {}
+    for profile in profiles:
+        for key in profile:
+            if key not in merged:
+                merged[key] = _merge_values([p[key] for p in profiles if key in p])
+    return merged
+
+
+def extract_style(samples_dir: str = None, output_path: str = None) -> dict:
+    """
+    Main function: reads samples, analyzes with Gemini, saves style profile locally.
+    Returns the style profile dict.
+    """
+    samples_dir = samples_dir or config.STYLE_SAMPLES_DIR
+    output_path = output_path or config.STYLE_PROFILE_PATH
+
+    if not config.GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not set. Please add it to your .env file.")
+
+    # Load writing samples
+    print(f"📂 Loading samples from: {os.path.abspath(samples_dir)}")
+    samples = load_samples(samples_dir)
+
+    if not samples:
+        raise FileNotFoundError(
+            f"No text files found in '{os.path.abspath(samples_dir)}'. "
+            f"Please add .txt, .eml, .msg, .md, or .html files."
+        )
+
+    print(f"  ✓ Loaded {len(samples)} writing samples")
+
+    # Sample sets too large for one prompt are analyzed in parallel batches
+    chunks = _chunk_samples(samples)
+    if len(chunks) == 1:
+        print("🤖 Analyzing writing style with Gemini...")
+        style_profile = _analyze_samples(samples)
+    else:
+        print(f"🤖 Analyzing writing style with Gemini ({len(chunks)} batches)...")
+        with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_PARALLEL_ANALYSES)) as executor:
+            profiles = list(executor.map(_analyze_samples, chunks))
+        style_profile = _combine_profiles(profiles)
 
     # Save locally
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(style_profile, f, indent=2, ensure_ascii=False)
+    _read_style_profile.cache_clear()  # don't trust mtime alone on coarse-grained filesystems
 
     print(f"  ✓ Style profile saved to: {os.path.abspath(output_path)}")
     return style_profile
 
 
-def load_style_profile(path: str = None) -> dict:
-    """Load a previously saved style profile from disk."""
+def load_style_profile(path: str = None, mtime_ns: int = None) -> dict:
+    """
+    Load a previously saved style profile from disk.
+    
+    The parsed profile is reused while the file is unchanged. Pass mtime_ns
+    (st_mtime_ns) if the caller has already stat'ed the file.
+    """
     path = path or config.STYLE_PROFILE_PATH
-    if not os.path.exists(path):
-        raise FileNotFoundError(
-            f"No style profile found at '{path}'. Run extract_style() first."
-        )
+    if mtime_ns is None:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"No style profile found at '{path}'. Run extract_style() first."
+            )
+    return _read_style_profile(path, mtime_ns)
+
+
+@lru_cache(maxsize=4)
+def _read_style_profile(path: str, mtime_ns: int) -> dict:
+    """Parse a style profile file (memoized on path and modification time)."""
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -0,0 +1,58 @@
+"""
+Tests for outlook_client's export decisions.
+
+outlook_client needs pywin32, so these only run on Windows; Outlook itself is
+not needed (mail items are plain stand-ins).
+"""
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import outlook_client
+except ImportError:  # pywin32 not installed (not on Windows)
+    outlook_client = None
+
+
+class FakeNamespace:
+    """Resolves EntryIDs to stand-in mail items with just a Body."""
+
+    def __init__(self, bodies: dict):
+        self.bodies = bodies
+
+    def GetItemFromID(self, entry_id):
+        return SimpleNamespace(Body=self.bodies[entry_id])
+
+
+@unittest.skipIf(outlook_client is None, "outlook_client needs pywin32")
+class ExportBodyTest(unittest.TestCase):
+
+    def test_truncated_blank_preview_is_not_treated_as_short(self):
+        # A table's PR_BODY stops at 255 characters; this one is all whitespace
+        body = " " * 255 + "Hi Dana, the quarterly numbers are attached. Thanks!"
+        email = {"entry_id": "long", "body_preview": body[:255]}
+        self.assertLess(len(email["body_preview"].strip()), 20)
+
+        namespace = FakeNamespace({"long": body})
+        self.assertEqual(outlook_client._export_body(namespace, email), body)
+
+    def test_short_body_is_skipped(self):
+        namespace = FakeNamespace({"short": "  Thanks!\r\n"})
+        self.assertIsNone(outlook_client._export_body(namespace, {"entry_id": "short"}))
+
+    def test_missing_body_is_skipped(self):
+        namespace = FakeNamespace({"empty": None})
+        self.assertIsNone(outlook_client._export_body(namespace, {"entry_id": "empty"}))
+
+    def test_scanned_item_is_not_looked_up_again(self):
+        item = SimpleNamespace(Body="Thanks, I'll review the draft tomorrow morning.")
+        namespace = FakeNamespace({})  # any GetItemFromID call would raise KeyError
+        email = {"entry_id": "scanned", "_item": item}
+        self.assertEqual(outlook_client._export_body(namespace, email), item.Body)
+
+
+if __name__ == "__main__":
+    unittest.main()